@@ -33,6 +33,10 @@
     Optional. If specified, shows what changes would be made without actually modifying files.
     Useful for previewing the reorganization before applying changes.
 
+.PARAMETER Quiet
+    Optional. If specified, omits the per-file allocation lines and prints only category totals
+    and the summary.
+
 .PARAMETER DebugMode
     Optional. If specified, enables detailed debug output for troubleshooting.
 
@@ -48,6 +52,10 @@
     .\Organize-LoggerEventIds.ps1 -DebugMode
     Runs with detailed debug output for troubleshooting
 
+.EXAMPLE
+    .\Organize-LoggerEventIds.ps1 -WhatIf -Quiet
+    Previews the reorganization showing only per-category totals
+
 .NOTES
     This script ensures no duplicate EventIds are created and validates all changes before applying them.
     Each category has a dedicated 1000-number range with automatic gap management between files.
@@ -60,10 +68,65 @@ param(
     [Parameter(Mandatory = $false)]
     [switch]$WhatIf = $false,
 
+    [Parameter(Mandatory = $false)]
+    [switch]$Quiet = $false,
+
     [Parameter(Mandatory = $false)]
     [switch]$DebugMode = $false
 )
 
+# Regex patterns compiled once and reused for every file and line
+# (IgnoreCase keeps the semantics of PowerShell's -match operator)
+$RegexOptions = [System.Text.RegularExpressions.RegexOptions]::Compiled -bor [System.Text.RegularExpressions.RegexOptions]::IgnoreCase
+$EventIdRegex = [regex]::new('EventId\s*=\s*(\d+)', $RegexOptions)
+
+# Path patterns per functional area, more specific patterns first - match actual project structure
+$CategoryPatterns = [ordered]@{
+    "Domain" = 'Domain[/\\]Services'
+    "Application" = 'Application[/\\]Services'
+    "Server" = 'Server[/\\]'
+    "Api" = 'Api[/\\]'
+    "Infrastructure" = 'Infrastructure[/\\]Services'
+    "Integration" = 'Infrastructure[/\\]Integrations'
+    "Audio" = '(Audio|Media|LibVLC|Player)'
+    "Metrics" = '(Metrics|Performance)'
+    "Notifications" = '(Notification|Publisher)'
+}
+
+# Category base EventId ranges, built once and indexed directly
+$CategoryBases = @{
+    "Domain" = 10000        # 10000-10999: Domain Services
+    "Application" = 11000   # 11000-11999: Application Services
+    "Server" = 12000        # 12000-12999: Server Handlers
+    "Api" = 13000          # 13000-13999: API Layer
+    "Infrastructure" = 14000 # 14000-14999: Infrastructure Services
+    "Integration" = 15000   # 15000-15999: Integration Services
+    "Audio" = 16000        # 16000-16999: Audio Services
+    "Notifications" = 17000 # 17000-17999: Notifications & Messaging
+    "Metrics" = 18000      # 18000-18999: Metrics & Monitoring
+}
+
+# All category patterns fused into one classifier. Each branch is an anchored lookahead that
+# tags its category with an empty named group; branches are tried in table order, so the
+# earliest pattern that occurs anywhere in the path wins, exactly as with one test per pattern.
+$CategoryRegex = [regex]::new(
+    '^(?:' + (@($CategoryPatterns.GetEnumerator() | ForEach-Object { "(?=.*?$($_.Value))(?<$($_.Key)>)" }) -join '|') + ')',
+    $RegexOptions
+)
+
+# UTF-8 without BOM, matching what Set-Content -Encoding UTF8 writes on PowerShell 7
+$Utf8NoBom = [System.Text.UTF8Encoding]::new($false)
+
+# Directory names that are skipped without being descended into while scanning; in addition,
+# every directory whose name ends in "Tests" (Tests/, SnapDog2.Tests/, ...) is skipped
+$ExcludedDirectories = [System.Collections.Generic.HashSet[string]]::new(
+    [string[]]@("bin", "obj", ".git", "node_modules"),
+    [System.StringComparer]::OrdinalIgnoreCase
+)
+
+# Generated sources are rewritten by their generator, so renumbering them is pointless
+$GeneratedFileRegex = [regex]::new('\.(Designer|g|g\.i|generated)\.cs$', $RegexOptions)
+
 # Function to write colored output to console
 function Write-ColoredOutput {
     param(
@@ -93,87 +156,191 @@ function Get-FileCategory {
         [string]$RelativePath
     )
     
-    # More specific patterns first - match actual project structure
-    if ($RelativePath -match "Domain[/\\]Services") { 
-        return "Domain" 
-    }
-    elseif ($RelativePath -match "Application[/\\]Services") { 
-        return "Application" 
-    }
-    elseif ($RelativePath -match "Server[/\\]") { 
-        return "Server" 
-    }
-    elseif ($RelativePath -match "Api[/\\]") { 
-        return "Api" 
-    }
-    elseif ($RelativePath -match "Infrastructure[/\\]Services") { 
-        return "Infrastructure" 
-    }
-    elseif ($RelativePath -match "Infrastructure[/\\]Integrations") { 
-        return "Integration" 
-    }
-    elseif ($RelativePath -match "(Audio|Media|LibVLC|Player)") { 
-        return "Audio" 
-    }
-    elseif ($RelativePath -match "(Metrics|Performance)") { 
-        return "Metrics" 
+    $match = $CategoryRegex.Match($RelativePath)
+    if ($match.Success) {
+        foreach ($category in $CategoryPatterns.Keys) {
+            if ($match.Groups[$category].Success) {
+                return $category
+            }
+        }
     }
-    elseif ($RelativePath -match "(Notification|Publisher)") { 
-        return "Notifications" 
+    
+    return "Infrastructure" # Default fallback
+}
+
+# Function to extract EventIds from file content, in the order they appear
+function Get-EventIdsFromContent {
+    param(
+        [string]$Content
+    )
+    
+    $eventIds = [System.Collections.Generic.List[int]]::new()
+    
+    # Only run the regex when the file can contain a match at all (e.g. not purely positional attributes)
+    if ($Content -and $Content.Contains("EventId", [System.StringComparison]::OrdinalIgnoreCase)) {
+        # Find EventId = number patterns in a single pass over the whole file
+        foreach ($match in $EventIdRegex.Matches($Content)) {
+            $eventIds.Add([int]$match.Groups[1].Value)
+        }
     }
-    else { 
-        return "Infrastructure" # Default fallback
+    
+    # The leading comma keeps PowerShell from unrolling the list on return
+    return , $eventIds
+}
+
+# Function to find EventIds that occur more than once, counted in a single pass
+function Get-DuplicateEventIds {
+    param(
+        [int[]]$EventIds
+    )
+    
+    $counts = [System.Collections.Generic.Dictionary[int, int]]::new()
+    foreach ($eventId in $EventIds) {
+        $count = 0
+        [void]$counts.TryGetValue($eventId, [ref]$count)
+        $counts[$eventId] = $count + 1
     }
+    
+    $duplicates = @(foreach ($entry in $counts.GetEnumerator()) {
+        if ($entry.Value -gt 1) {
+            [PSCustomObject]@{
+                EventId = $entry.Key
+                Count = $entry.Value
+            }
+        }
+    })
+    
+    # The leading comma keeps an empty result from collapsing into $null
+    return , @($duplicates | Sort-Object EventId)
+}
+
+# Function to decide whether a directory is excluded from the scan
+function Test-ExcludedDirectory {
+    param(
+        [Parameter(Mandatory = $true)]
+        [string]$Name
+    )
+    
+    return $ExcludedDirectories.Contains($Name) -or $Name.EndsWith("Tests", [System.StringComparison]::OrdinalIgnoreCase)
 }
 
-# Function to get category base EventId ranges
-function Get-CategoryBase {
+# Function to decide whether a file is generated source, logging the skip in debug mode
+function Test-GeneratedFile {
     param(
         [Parameter(Mandatory = $true)]
-        [string]$Category
+        [string]$FullName
     )
     
-    $categoryBases = @{
-        "Domain" = 10000        # 10000-10999: Domain Services
-        "Application" = 11000   # 11000-11999: Application Services
-        "Server" = 12000        # 12000-12999: Server Handlers
-        "Api" = 13000          # 13000-13999: API Layer
-        "Infrastructure" = 14000 # 14000-14999: Infrastructure Services
-        "Integration" = 15000   # 15000-15999: Integration Services
-        "Audio" = 16000        # 16000-16999: Audio Services
-        "Notifications" = 17000 # 17000-17999: Notifications & Messaging
-        "Metrics" = 18000      # 18000-18999: Metrics & Monitoring
+    $isGenerated = $GeneratedFileRegex.IsMatch([System.IO.Path]::GetFileName($FullName))
+    if ($isGenerated -and $DebugMode) {
+        Write-ColoredOutput "  Skipping generated file: $FullName" "White"
     }
     
-    return $categoryBases[$Category]
+    return $isGenerated
 }
 
-# Function to extract EventIds from file content
-function Get-EventIdsFromContent {
+# Function to enumerate C# source files, pruning excluded directories before descending
+function Get-CSharpFiles {
+    param(
+        [Parameter(Mandatory = $true)]
+        [string]$Root
+    )
+    
+    $pending = [System.Collections.Generic.Stack[System.IO.DirectoryInfo]]::new()
+    $pending.Push([System.IO.DirectoryInfo]::new($Root))
+    
+    while ($pending.Count -gt 0) {
+        $directory = $pending.Pop()
+        
+        # Files come out in name order, then subdirectories in name order, keeping the
+        # allocation order Get-ChildItem -Recurse produced
+        $directory.EnumerateFiles("*.cs") | Where-Object { -not (Test-GeneratedFile -FullName $_.FullName) } | Sort-Object Name
+        
+        $subdirectories = @($directory.EnumerateDirectories() | Where-Object {
+            # Don't follow symlinked directories, and never enter build output
+            -not $_.Attributes.HasFlag([System.IO.FileAttributes]::ReparsePoint) -and
+            -not (Test-ExcludedDirectory -Name $_.Name)
+        } | Sort-Object Name)
+        
+        for ($i = $subdirectories.Count - 1; $i -ge 0; $i--) {
+            $pending.Push($subdirectories[$i])
+        }
+    }
+}
+
+# Function to list C# source files from the git index, or $null when Root is not inside a work tree.
+# Unlike Get-CSharpFiles this honors .gitignore, so ignored .cs files are not renumbered.
+function Get-GitCSharpFiles {
     param(
-        [string[]]$Content
+        [Parameter(Mandatory = $true)]
+        [string]$Root
     )
     
-    $eventIds = @()
+    if (-not (Get-Command git -ErrorAction SilentlyContinue)) {
+        return $null
+    }
+    
+    # git writes paths as UTF-8; decode them as such instead of the console (OEM) code page
+    $previousEncoding = [Console]::OutputEncoding
+    try {
+        [Console]::OutputEncoding = $Utf8NoBom
+        
+        # Tracked plus untracked-but-not-ignored files, so new sources are picked up as well
+        $output = git -C $Root ls-files -z --cached --others --exclude-standard -- "*.cs" 2>$null
+        $exitCode = $LASTEXITCODE
+    }
+    finally {
+        [Console]::OutputEncoding = $previousEncoding
+    }
     
-    if (-not $Content) {
-        return $eventIds
+    if ($exitCode -ne 0) {
+        return $null
     }
     
-    for ($i = 0; $i -lt $Content.Length; $i++) {
-        $line = $Content[$i]
+    $relativePaths = @(($output -join "") -split "`0" | Where-Object {
+        if (-not $_) {
+            return $false
+        }
         
-        # Find EventId = number patterns
-        if ($line -match 'EventId\s*=\s*(\d+)') {
-            $eventIds += [PSCustomObject]@{
-                LineNumber = $i
-                EventId = [int]$matches[1]
-                OriginalLine = $line
+        # Apply the same directory and generated-file rules as Get-CSharpFiles
+        $segments = $_.Split('/')
+        for ($i = 0; $i -lt $segments.Count - 1; $i++) {
+            if (Test-ExcludedDirectory -Name $segments[$i]) {
+                return $false
             }
         }
+        -not (Test-GeneratedFile -FullName (Join-Path $Root $_))
+    } | Select-Object -Unique)
+    
+    # The leading comma keeps an empty result from collapsing into $null
+    if ($relativePaths.Count -eq 0) {
+        return , @()
     }
     
-    return $eventIds
+    # Order like Get-CSharpFiles: at every directory level, files sort before subdirectories,
+    # and each level is compared by name on its own
+    $depth = ($relativePaths | ForEach-Object { $_.Split('/').Count } | Measure-Object -Maximum).Maximum
+    $sortKeys = for ($level = 0; $level -lt $depth; $level++) {
+        {
+            $segments = $_.Split('/')
+            if ($level -ge $segments.Count) { "" }
+            elseif ($level -eq $segments.Count - 1) { "0" + $segments[$level] }
+            else { "1" + $segments[$level] }
+        }.GetNewClosure()
+    }
+    
+    $files = @($relativePaths | Sort-Object -Property $sortKeys | ForEach-Object {
+        $file = [System.IO.FileInfo]::new((Join-Path $Root $_))
+        # Deleted-but-still-staged files are listed by git but no longer exist
+        if ($file.Exists) {
+            $file
+        }
+        elseif ($DebugMode) {
+            Write-ColoredOutput "  Skipping file listed by git but missing on disk: $($file.FullName)" "Yellow"
+        }
+    })
+    
+    return , $files
 }
 
 # Main script execution
@@ -197,11 +364,33 @@ try {
     # Find all C# files with LoggerMessage
     Write-ColoredOutput "`n📁 Scanning for LoggerMessage files..." "Blue"
     
-    $csFiles = Get-ChildItem -Path $snapDogPath -Filter "*.cs" -Recurse | 
-        Where-Object { 
-            $_.FullName -notmatch "(obj|Tests)" -and
-            (Get-Content $_.FullName -Raw -ErrorAction SilentlyContinue) -match "LoggerMessage"
+    $sourceFiles = Get-GitCSharpFiles -Root $snapDogPath
+    if ($null -eq $sourceFiles) {
+        $sourceFiles = Get-CSharpFiles -Root $snapDogPath
+    }
+    
+    # Each file is read exactly once; the content is kept for analysis and rewriting
+    $csFiles = @(foreach ($file in $sourceFiles) {
+        # Read straight through .NET; the Get-Content provider pipeline is far slower per file
+        try {
+            $content = [System.IO.File]::ReadAllText($file.FullName, $Utf8NoBom)
+        }
+        catch {
+            if ($DebugMode) {
+                Write-ColoredOutput "  Skipping unreadable file: $($file.FullName) ($($_.Exception.Message))" "Yellow"
+            }
+            continue
         }
+        
+        # A plain substring test is enough to tell whether a file declares logger messages
+        if ($content.Contains("LoggerMessage", [System.StringComparison]::OrdinalIgnoreCase)) {
+            [PSCustomObject]@{
+                File = $file
+                RelativePath = [System.IO.Path]::GetRelativePath($snapDogPath, $file.FullName)
+                Content = $content
+            }
+        }
+    })
     
     Write-ColoredOutput "📊 Found $($csFiles.Count) files with LoggerMessage" "Yellow"
     
@@ -213,13 +402,14 @@ try {
     # Phase 1: Analyze all files and their EventId usage patterns
     Write-ColoredOutput "`n📋 Phase 1: Analyzing EventId usage..." "Blue"
     
-    $fileAnalysis = @()
+    $fileAnalysis = [System.Collections.Generic.List[object]]::new()
     $categoryFiles = @{}
     
-    foreach ($file in $csFiles) {
-        $relativePath = $file.FullName.Replace($snapDogPath, "").TrimStart('\/')
+    foreach ($sourceFile in $csFiles) {
+        $file = $sourceFile.File
+        $content = $sourceFile.Content
+        $relativePath = $sourceFile.RelativePath
         $category = Get-FileCategory -RelativePath $relativePath
-        $content = Get-Content -Path $file.FullName -Encoding UTF8 -ErrorAction SilentlyContinue
         $eventIds = Get-EventIdsFromContent -Content $content
         
         if ($eventIds.Count -gt 0) {
@@ -232,12 +422,12 @@ try {
                 Content = $content
             }
             
-            $fileAnalysis += $fileInfo
+            $fileAnalysis.Add($fileInfo)
             
             if (-not $categoryFiles.ContainsKey($category)) {
-                $categoryFiles[$category] = @()
+                $categoryFiles[$category] = [System.Collections.Generic.List[object]]::new()
             }
-            $categoryFiles[$category] += $fileInfo
+            $categoryFiles[$category].Add($fileInfo)
         }
     }
     
@@ -248,11 +438,14 @@ try {
     $nextAvailableId = @{}
     
     foreach ($category in ($categoryFiles.Keys | Sort-Object)) {
-        $categoryBase = Get-CategoryBase -Category $category
+        $categoryBase = $CategoryBases[$category]
         $nextAvailableId[$category] = $categoryBase
         
         Write-ColoredOutput "  $category (base: $categoryBase):" "White"
         
+        # Per-file lines are collected and written to the host in one call per category
+        $allocationLines = [System.Collections.Generic.List[string]]::new()
+        
         foreach ($fileInfo in $categoryFiles[$category]) {
             $startId = $nextAvailableId[$category]
             $endId = $startId + $fileInfo.EventIdCount - 1
@@ -266,7 +459,11 @@ try {
                 FileInfo = $fileInfo
             }
             
-            Write-ColoredOutput "    $($fileInfo.RelativePath): $startId-$endId ($($fileInfo.EventIdCount) EventIds)" "White"
+            $allocationLines.Add("    $($fileInfo.RelativePath): $startId-$endId ($($fileInfo.EventIdCount) EventIds)")
+        }
+        
+        if (-not $Quiet -and $allocationLines.Count -gt 0) {
+            Write-ColoredOutput ($allocationLines -join [Environment]::NewLine) "White"
         }
         
         $totalUsed = $nextAvailableId[$category] - $categoryBase
@@ -282,39 +479,34 @@ try {
     # Phase 3: Generate new EventId mappings with validation
     Write-ColoredOutput "`n📋 Phase 3: Generating EventId mappings..." "Blue"
     
-    # First, collect all current EventIds to detect conflicts
-    $allCurrentEventIds = @()
-    foreach ($fileInfo in $fileAnalysis) {
-        foreach ($eventId in $fileInfo.EventIds) {
-            $allCurrentEventIds += $eventId.EventId
-        }
-    }
+    # First, collect all current EventIds to detect conflicts (one collection, no per-id array copies)
+    $allCurrentEventIds = @(foreach ($fileInfo in $fileAnalysis) { $fileInfo.EventIds })
     
     # Check for current conflicts
-    $currentConflicts = $allCurrentEventIds | Group-Object | Where-Object { $_.Count -gt 1 }
+    $currentConflicts = Get-DuplicateEventIds -EventIds $allCurrentEventIds
     if ($currentConflicts) {
         Write-ColoredOutput "⚠️ Found EventId conflicts that need fixing:" "Yellow"
         foreach ($conflict in $currentConflicts) {
-            Write-ColoredOutput "  EventId $($conflict.Name) used $($conflict.Count) times" "Yellow"
+            Write-ColoredOutput "  EventId $($conflict.EventId) used $($conflict.Count) times" "Yellow"
         }
     }
     
     $totalChanges = 0
-    $allNewEventIds = @()
+    $allNewEventIds = [System.Collections.Generic.List[int]]::new()
     
     foreach ($allocation in $allAllocations.Values) {
         $fileInfo = $allocation.FileInfo
         $startId = $allocation.StartId
         
         for ($i = 0; $i -lt $fileInfo.EventIds.Count; $i++) {
-            $oldId = $fileInfo.EventIds[$i].EventId
+            $oldId = $fileInfo.EventIds[$i]
             $newId = $startId + $i
             
             if ($oldId -ne $newId) {
                 $totalChanges++
             }
             
-            $allNewEventIds += $newId
+            $allNewEventIds.Add($newId)
         }
     }
     
@@ -325,11 +517,11 @@ try {
     }
     
     # Phase 4: Verify no duplicates in new allocation
-    $duplicateCheck = $allNewEventIds | Group-Object | Where-Object { $_.Count -gt 1 }
+    $duplicateCheck = Get-DuplicateEventIds -EventIds $allNewEventIds
     if ($duplicateCheck) {
         Write-ColoredOutput "❌ CRITICAL: New allocation would create duplicates!" "Red"
         foreach ($dup in $duplicateCheck) {
-            Write-ColoredOutput "  EventId $($dup.Name) appears $($dup.Count) times" "Red"
+            Write-ColoredOutput "  EventId $($dup.EventId) appears $($dup.Count) times" "Red"
         }
         exit 1
     }
@@ -346,31 +538,39 @@ try {
     } else {
         Write-ColoredOutput "`n✏️ Applying changes..." "Blue"
         
+        $forceRewrite = [bool]$currentConflicts
         $actualChanges = 0
         
         foreach ($allocation in $allAllocations.Values) {
             $fileInfo = $allocation.FileInfo
-            $startId = $allocation.StartId
-            $updatedContent = $fileInfo.Content.Clone()
-            $fileChanged = $false
             
-            for ($i = 0; $i -lt $fileInfo.EventIds.Count; $i++) {
-                $eventIdInfo = $fileInfo.EventIds[$i]
-                $oldId = $eventIdInfo.EventId
-                $newId = $startId + $i
+            # Matches are visited in file order, so the n-th match receives StartId + n.
+            # State lives in a hashtable because the evaluator runs in a child scope.
+            $state = @{ NextId = $allocation.StartId; Changes = 0 }
+            $evaluator = [System.Text.RegularExpressions.MatchEvaluator] {
+                param($match)
+                
+                $oldId = [int]$match.Groups[1].Value
+                $newId = $state.NextId
+                $state.NextId++
                 
-                if ($oldId -ne $newId -or $currentConflicts) {
-                    $oldLine = $updatedContent[$eventIdInfo.LineNumber]
-                    $newLine = $oldLine -replace "EventId\s*=\s*$oldId\b", "EventId = $newId"
-                    $updatedContent[$eventIdInfo.LineNumber] = $newLine
-                    $actualChanges++
-                    $fileChanged = $true
+                if ($oldId -ne $newId -or $forceRewrite) {
+                    $state.Changes++
+                    return "EventId = $newId"
                 }
+                
+                return $match.Value
             }
             
-            if ($fileChanged) {
-                $updatedContent | Set-Content -Path $fileInfo.File.FullName -Encoding UTF8
+            $updatedContent = $EventIdRegex.Replace($fileInfo.Content, $evaluator)
+            
+            # A forced rewrite can reproduce the file byte for byte; skip the write then.
+            # Write failures throw and end the run through the catch block below.
+            if ($state.Changes -gt 0 -and -not [string]::Equals($updatedContent, $fileInfo.Content, [System.StringComparison]::Ordinal)) {
+                [System.IO.File]::WriteAllText($fileInfo.File.FullName, $updatedContent, $Utf8NoBom)
             }
+            
+            $actualChanges += $state.Changes
         }
         
         Write-ColoredOutput "✅ Successfully reorganized $actualChanges EventIds with no duplicates!" "Green"
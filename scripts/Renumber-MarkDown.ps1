@@ -585,9 +585,10 @@ function TableOfContents {
         [string]$TocFilePath
     )
 
-    $toc = @()
-    $toc += "# Table of Contents"
-    $toc += ""
+    # Collect lines in a list; += on an array copies the whole array on every append
+    $toc = [System.Collections.Generic.List[string]]::new()
+    $toc.Add("# Table of Contents")
+    $toc.Add("")
 
     # Calculate the directory where the TOC file will be placed
     $tocDir = Split-Path $TocFilePath -Parent
@@ -599,40 +600,40 @@ function TableOfContents {
 
         $hasSubLevels = ($fileEntries | Where-Object { $_.Level -gt 1 }).Count -gt 0
 
+        # Calculate proper relative path from TOC file to target file (same for all its entries)
+        $targetFilePath = $fileInfo.FullPath
+        $relativePath = [System.IO.Path]::GetRelativePath($tocDir, $targetFilePath)
+        # Normalize path separators for cross-platform compatibility
+        $relativePath = $relativePath.Replace('\', '/')
+
         foreach ($entry in $fileEntries) {
             # Generate anchor link for all levels
             $anchor = Get-StableAnchor -HeadingText $entry.FullText
 
-            # Calculate proper relative path from TOC file to target file
-            $targetFilePath = $fileInfo.FullPath
-            $relativePath = [System.IO.Path]::GetRelativePath($tocDir, $targetFilePath)
-            # Normalize path separators for cross-platform compatibility
-            $relativePath = $relativePath.Replace('\', '/')
-
             $linkPath = "$relativePath#$anchor"
 
             if ($entry.Level -eq 1) {
                 # Level 1: Use clean text without numbering
                 $linkText = $entry.Text # e.g., "Introduction"
                 $link = "[$linkText]($linkPath)"
-                $toc += "$($entry.Number). $link"
+                $toc.Add("$($entry.Number). $link")
 
                 # Add blank line after level 1 if there are sub-levels
                 if ($hasSubLevels) {
-                    $toc += ""
+                    $toc.Add("")
                 }
             }
             else {
                 # Sub-levels: Include hierarchical numbering in the link text
                 $linkText = "$($entry.Number) $($entry.Text)" # e.g., "1.1 Project Vision & Mission"
                 $link = "[$linkText]($linkPath)"
-                $toc += "- $link" # Unordered list at root level, not indented
+                $toc.Add("- $link") # Unordered list at root level, not indented
             }
         }
 
         # Add blank line after each file's entries (except the last)
         if ($currentFileIndex -lt ($FileInfos.Count - 1)) {
-            $toc += ""
+            $toc.Add("")
         }
 
         $currentFileIndex++
@@ -744,7 +745,7 @@ try {
     $tocContent = TableOfContents -AllTocEntries $allTocEntries -FileInfos $fileInfos -TocFilePath $TocFile
 
     # Write TOC file
-    $tocContent | Set-Content -Path $TocFile -Encoding UTF8
+    Set-Content -Path $TocFile -Value $tocContent -Encoding UTF8
 
     Write-Host "✓ Successfully processed $($files.Count) files with reference handling" -ForegroundColor Green
     Write-Host "✓ Generated table of contents: $TocFile" -ForegroundColor Green